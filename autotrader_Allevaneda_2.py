@@ -17,7 +17,7 @@
 #     <https://www.gnu.org/licenses/>.
 import asyncio
 import itertools
-import numpy as np
+import math
 
 from typing import List
 
@@ -29,14 +29,12 @@ POSITION_LIMIT = 100
 TICK_SIZE_IN_CENTS = 100
 MIN_BID_NEAREST_TICK = (MINIMUM_BID + TICK_SIZE_IN_CENTS) // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS
 MAX_ASK_NEAREST_TICK = MAXIMUM_ASK // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS
-MID_PRICE_FUTURE = []
-RETURNS_FUTURE = []
 MID_PRICE_ETF = []
-VOL = []
 END_TIME = 900
 TICK_INTERVAL = 0.25
-BID_PRICES = []
-ASK_PRICES = []
+SESSION_VOL_SCALE = math.sqrt(END_TIME * 4)
+HALF_TICK = TICK_SIZE_IN_CENTS / 2
+SPREAD_CONST = 2 * math.log(1 + 0.01 / 0.5) / 0.01
 
 class AutoTrader(BaseAutoTrader):
     """Example Auto-trader.
@@ -52,10 +50,15 @@ class AutoTrader(BaseAutoTrader):
         """Initialise a new instance of the AutoTrader class."""
         super().__init__(loop, team_name, secret)
         self.order_ids = itertools.count(1)
-        self.bids = set()
-        self.asks = set()
+        self._order_side = {} # side of each of our live orders, by order id
         self.ask_id = self.ask_price = self.bid_id = self.bid_price = self.position = 0
 
+        # Running mean and M2 (Welford) of the Future returns, to get their volatility without keeping them
+        self._last_mid = 0
+        self._n_returns = 0
+        self._returns_mean = 0.0
+        self._returns_m2 = 0.0
+
     def on_error_message(self, client_order_id: int, error_message: bytes) -> None:
         """Called when the exchange detects an error.
 
@@ -63,7 +66,7 @@ class AutoTrader(BaseAutoTrader):
         will identify that order, otherwise the client_order_id will be zero.
         """
         self.logger.warning("error with order %d: %s", client_order_id, error_message.decode())
-        if client_order_id != 0 and (client_order_id in self.bids or client_order_id in self.asks):
+        if client_order_id != 0 and client_order_id in self._order_side:
             self.on_order_status_message(client_order_id, 0, 0, 0)
 
     def on_hedge_filled_message(self, client_order_id: int, price: int, volume: int) -> None:
@@ -89,21 +92,30 @@ class AutoTrader(BaseAutoTrader):
                          sequence_number)
     
         if instrument == Instrument.FUTURE:
+            # Skip the update if one side of the book is empty, the mid price would be meaningless
+            if not ask_prices[0] or not bid_prices[0]:
+                return
             mid_price_future = (ask_prices[0] + bid_prices[0]) // 2
-            MID_PRICE_FUTURE.append(mid_price_future)
-            if len(MID_PRICE_FUTURE) > 1:
-                returns_future = (MID_PRICE_FUTURE[-1] - MID_PRICE_FUTURE[-2]) / MID_PRICE_FUTURE[-2]
-                RETURNS_FUTURE.append(returns_future)
-            self.logger.info(f"mid price for the Future: {mid_price_future}")
-            self.logger.info(f"mid price vector length for the Future: {len(MID_PRICE_FUTURE)}")
+            if self._last_mid:
+                returns_future = (mid_price_future - self._last_mid) / self._last_mid
+                self._n_returns += 1
+                delta = returns_future - self._returns_mean
+                self._returns_mean += delta / self._n_returns
+                self._returns_m2 += delta * (returns_future - self._returns_mean)
+            self._last_mid = mid_price_future
+            self.logger.info("mid price for the Future: %d", mid_price_future)
+            self.logger.info("number of returns for the Future: %d", self._n_returns)
             
-            if len(RETURNS_FUTURE) > 20:
-                vol_future = np.std(np.array(RETURNS_FUTURE)) * np.sqrt(END_TIME * 4)
-                VOL.append(vol_future)
-                self.logger.info(f"volatility for the Future: {vol_future}")
-                reservation_price = mid_price_future - self.position * 0.01 * (vol_future ** 2) * (END_TIME - (TICK_INTERVAL * sequence_number))
-                self.logger.info(f"reservation price for the Future: {reservation_price}")
-                optimal_spread = 0.01 * (vol_future ** 2) * (END_TIME - TICK_INTERVAL * sequence_number) + 2 * np.log(1 + 0.01 / 0.5) / 0.01
+            if self._n_returns > 20:
+                # Population standard deviation of all the returns so far, as np.std would give
+                variance = max(self._returns_m2, 0.0) / self._n_returns
+                vol_future = math.sqrt(variance) * SESSION_VOL_SCALE
+                self.logger.info("volatility for the Future: %s", vol_future)
+                # gamma * sigma^2 * (T - t), shared by the reservation price and the optimal spread
+                inventory_term = 0.01 * vol_future * vol_future * (END_TIME - TICK_INTERVAL * sequence_number)
+                reservation_price = mid_price_future - self.position * inventory_term
+                self.logger.info("reservation price for the Future: %s", reservation_price)
+                optimal_spread = inventory_term + SPREAD_CONST
         
         """
         if instrument == Instrument.ETF:
@@ -118,14 +130,12 @@ class AutoTrader(BaseAutoTrader):
                 self.logger.info(f"volatility for the ETF: {vol_etf}")
         """
 
-        if instrument == Instrument.FUTURE and len(RETURNS_FUTURE) > 20:
+        if instrument == Instrument.FUTURE and self._n_returns > 20:
             price_adjustment = - (self.position // LOT_SIZE) * TICK_SIZE_IN_CENTS 
-            new_bid_price = int((reservation_price - optimal_spread * TICK_SIZE_IN_CENTS  / 2) // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS)
-            BID_PRICES.append(new_bid_price)
-            new_ask_price = int((reservation_price + optimal_spread * TICK_SIZE_IN_CENTS / 2) // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS)   
-            ASK_PRICES.append(new_ask_price)
-            self.logger.info(f"new bid price: {new_bid_price}")
-            self.logger.info(f"new ask price: {new_ask_price}")
+            new_bid_price = int((reservation_price - optimal_spread * HALF_TICK) // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS)
+            new_ask_price = int((reservation_price + optimal_spread * HALF_TICK) // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS)   
+            self.logger.info("new bid price: %d", new_bid_price)
+            self.logger.info("new ask price: %d", new_ask_price)
                 
             if self.bid_id != 0 and new_bid_price not in (self.bid_price, 0):
                 self.send_cancel_order(self.bid_id)
@@ -137,16 +147,16 @@ class AutoTrader(BaseAutoTrader):
             if self.bid_id == 0 and new_bid_price != 0 and self.position < POSITION_LIMIT:
                 self.bid_id = next(self.order_ids)
                 self.bid_price = new_bid_price
-                self.send_insert_order(self.bid_id, Side.BUY, new_bid_price, np.minimum(25,POSITION_LIMIT - self.position), Lifespan.FILL_AND_KILL)
-                self.bids.add(self.bid_id)
-                self.logger.info(f"Order_ID BID: {self.order_ids}")
+                self.send_insert_order(self.bid_id, Side.BUY, new_bid_price, min(25,POSITION_LIMIT - self.position), Lifespan.FILL_AND_KILL)
+                self._order_side[self.bid_id] = Side.BUY
+                self.logger.info("Order_ID BID: %s", self.order_ids)
 
             if self.ask_id == 0 and new_ask_price != 0 and self.position > -POSITION_LIMIT:
                 self.ask_id = next(self.order_ids)
                 self.ask_price = new_ask_price
-                self.send_insert_order(self.ask_id, Side.SELL, new_ask_price, np.minimum(25,self.position + POSITION_LIMIT), Lifespan.FILL_AND_KILL)
-                self.asks.add(self.ask_id)
-                self.logger.info(f"Order_ID ASK: {self.order_ids}")
+                self.send_insert_order(self.ask_id, Side.SELL, new_ask_price, min(25,self.position + POSITION_LIMIT), Lifespan.FILL_AND_KILL)
+                self._order_side[self.ask_id] = Side.SELL
+                self.logger.info("Order_ID ASK: %s", self.order_ids)
 
     def on_order_filled_message(self, client_order_id: int, price: int, volume: int) -> None:
         """Called when one of your orders is filled, partially or fully.
@@ -162,10 +172,11 @@ class AutoTrader(BaseAutoTrader):
         self.logger.info(f"bid price: {bid_price}")
         self.logger.info(f"ask price: {bid_price}")
         """
-        if client_order_id in self.bids:
+        side = self._order_side.get(client_order_id)
+        if side == Side.BUY:
             self.position += volume
             self.send_hedge_order(next(self.order_ids), Side.ASK, MIN_BID_NEAREST_TICK,volume)
-        elif client_order_id in self.asks:
+        elif side == Side.SELL:
             self.position -= volume
             self.send_hedge_order(next(self.order_ids), Side.BID, MAX_ASK_NEAREST_TICK,volume)
 
@@ -187,9 +198,7 @@ class AutoTrader(BaseAutoTrader):
             elif client_order_id == self.ask_id:
                 self.ask_id = 0
 
-            # It could be either a bid or an ask
-            self.bids.discard(client_order_id)
-            self.asks.discard(client_order_id)
+            self._order_side.pop(client_order_id, None)
 
     def on_trade_ticks_message(self, instrument: int, sequence_number: int, ask_prices: List[int],
                                ask_volumes: List[int], bid_prices: List[int], bid_volumes: List[int]) -> None:
@@ -16,27 +16,49 @@
 #     License along with Ready Trader Go.  If not, see
 #     <https://www.gnu.org/licenses/>.
 import asyncio
-import itertools
-import numpy as np
+import collections
+import math
 
 from typing import List
 
 from ready_trader_go import BaseAutoTrader, Instrument, Lifespan, MAXIMUM_ASK, MINIMUM_BID, Side
 
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 
 LOT_SIZE = 10
 POSITION_LIMIT = 100
 TICK_SIZE_IN_CENTS = 100
 MIN_BID_NEAREST_TICK = (MINIMUM_BID + TICK_SIZE_IN_CENTS) // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS
 MAX_ASK_NEAREST_TICK = MAXIMUM_ASK // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS
-MID_PRICE_FUTURE = []
-RETURNS_FUTURE = []
 MID_PRICE_ETF = []
-VOL = []
 END_TIME = 900
 TICK_INTERVAL = 0.25
-BID_PRICES = []
-ASK_PRICES = []
+BUFFER_SIZE = 100
+MIN_SIZE = 20
+GAMMA = 0.01
+KAPPA = 0.3
+SESSION_VOL_SCALE = math.sqrt(END_TIME * 4)
+SPREAD_CONST = 2.0 * math.log(1.0 + GAMMA / KAPPA) / GAMMA
+HALF_TICK = TICK_SIZE_IN_CENTS / 2
+
+
+# Compiled eagerly for this signature at import, so the first tick does not pay the JIT cost
+@njit("UniTuple(int64, 2)(int64, int64, float64, float64, float64)", cache=True, fastmath=True)
+def compute_quotes(mid, position, vol, T_minus_t, time_left):
+    """ Return the Allevaneda and Stoikov (2007) bid and ask prices, rounded to the tick. """
+    gamma_v2 = GAMMA * vol * vol
+    reservation = mid - position * gamma_v2 * T_minus_t
+    opt_spread = gamma_v2 * time_left + SPREAD_CONST
+
+    # Floor to whole cents once, then round to the tick with integer division
+    bid = math.floor(reservation - opt_spread * HALF_TICK)
+    ask = math.floor(reservation + opt_spread * HALF_TICK)
+    return bid // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS, ask // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS
 
 
 class AutoTrader(BaseAutoTrader):
@@ -52,11 +74,21 @@ class AutoTrader(BaseAutoTrader):
     def __init__(self, loop: asyncio.AbstractEventLoop, team_name: str, secret: str):
         """Initialise a new instance of the AutoTrader class."""
         super().__init__(loop, team_name, secret)
-        self.order_ids = itertools.count(1)
-        self.bids = set()
-        self.asks = set()
+        self._next_id = 0
+        # Recent order ids, kept for fills that arrive after the cancel was sent
+        self.bids = collections.deque(maxlen=8)
+        self.asks = collections.deque(maxlen=8)
         self.ask_id = self.ask_price = self.bid_id = self.bid_price = self.position = 0
 
+        # Initialize the variables for the volatility control
+        self._last_mid = 0
+        self.vol = Volatility(BUFFER_SIZE)
+
+    def _new_id(self) -> int:
+        """Return the next client order id."""
+        self._next_id += 1
+        return self._next_id
+
     def on_error_message(self, client_order_id: int, error_message: bytes) -> None:
         """Called when the exchange detects an error.
 
@@ -90,21 +122,22 @@ class AutoTrader(BaseAutoTrader):
                          sequence_number)
     
         if instrument == Instrument.FUTURE:
+            # Skip the update if one side of the book is empty, the mid price would be meaningless
+            if not ask_prices[0] or not bid_prices[0]:
+                return
             mid_price_future = (ask_prices[0] + bid_prices[0]) // 2
-            MID_PRICE_FUTURE.append(mid_price_future)
-            if len(MID_PRICE_FUTURE) > 1:
-                returns_future = (MID_PRICE_FUTURE[-1] - MID_PRICE_FUTURE[-2]) / MID_PRICE_FUTURE[-2]
-                RETURNS_FUTURE.append(returns_future)
-            self.logger.info(f"mid price for the Future: {mid_price_future}")
-            self.logger.info(f"mid price vector length for the Future: {len(MID_PRICE_FUTURE)}")
+            if self._last_mid:
+                self.vol.push(math.log(mid_price_future / self._last_mid))
+            self._last_mid = mid_price_future
+            self.logger.info("mid price for the Future: %d", mid_price_future)
+            self.logger.info("returns buffer length for the Future: %d", len(self.vol))
             
-            if len(RETURNS_FUTURE) > 20:
-                vol_future = np.std(np.array(RETURNS_FUTURE)) * np.sqrt(END_TIME * 4)
-                VOL.append(vol_future)
-                self.logger.info(f"volatility for the Future: {vol_future}")
-                reservation_price = mid_price_future - self.position * 0.01 * (vol_future ** 2) * (END_TIME - (TICK_INTERVAL * sequence_number)) / END_TIME
-                self.logger.info(f"reservation price for the Future: {reservation_price}")
-                optimal_spread = 0.01 * (vol_future ** 2) * (END_TIME - TICK_INTERVAL * sequence_number) + 2 * np.log(1 + 0.01 / 0.3) / 0.01
+            if len(self.vol) > MIN_SIZE:
+                vol_future = self.vol.current_vol()
+                self.logger.info("volatility for the Future: %s", vol_future)
+                time_left = END_TIME - TICK_INTERVAL * sequence_number
+                new_bid_price, new_ask_price = compute_quotes(mid_price_future, self.position, vol_future,
+                                                              time_left / END_TIME, time_left)
         
         """
         if instrument == Instrument.ETF:
@@ -119,14 +152,10 @@ class AutoTrader(BaseAutoTrader):
                 self.logger.info(f"volatility for the ETF: {vol_etf}")
         """
 
-        if instrument == Instrument.FUTURE and len(RETURNS_FUTURE) > 20:
+        if instrument == Instrument.FUTURE and len(self.vol) > MIN_SIZE:
             price_adjustment = - (self.position // LOT_SIZE) * TICK_SIZE_IN_CENTS 
-            new_bid_price = int((reservation_price - optimal_spread * TICK_SIZE_IN_CENTS  / 2) // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS)
-            BID_PRICES.append(new_bid_price)
-            new_ask_price = int((reservation_price + optimal_spread * TICK_SIZE_IN_CENTS / 2) // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS)   
-            ASK_PRICES.append(new_ask_price)
-            self.logger.info(f"new bid price: {new_bid_price}")
-            self.logger.info(f"new ask price: {new_ask_price}")
+            self.logger.info("new bid price: %d", new_bid_price)
+            self.logger.info("new ask price: %d", new_ask_price)
 
             if self.bid_id != 0 and new_bid_price not in (self.bid_price, 0):
                 self.send_cancel_order(self.bid_id)
@@ -136,16 +165,16 @@ class AutoTrader(BaseAutoTrader):
                 self.ask_id = 0
 
             if self.bid_id == 0 and new_bid_price != 0 and self.position < POSITION_LIMIT:
-                self.bid_id = next(self.order_ids)
+                self.bid_id = self._new_id()
                 self.bid_price = new_bid_price
-                self.send_insert_order(self.bid_id, Side.BUY, new_bid_price, np.minimum(LOT_SIZE,POSITION_LIMIT - self.position), Lifespan.FILL_AND_KILL)
-                self.bids.add(self.bid_id)
+                self.send_insert_order(self.bid_id, Side.BUY, new_bid_price, min(LOT_SIZE,POSITION_LIMIT - self.position), Lifespan.FILL_AND_KILL)
+                self.bids.append(self.bid_id)
 
             if self.ask_id == 0 and new_ask_price != 0 and self.position > -POSITION_LIMIT:
-                self.ask_id = next(self.order_ids)
+                self.ask_id = self._new_id()
                 self.ask_price = new_ask_price
-                self.send_insert_order(self.ask_id, Side.SELL, new_ask_price, np.minimum(LOT_SIZE,self.position + POSITION_LIMIT), Lifespan.FILL_AND_KILL)
-                self.asks.add(self.ask_id)
+                self.send_insert_order(self.ask_id, Side.SELL, new_ask_price, min(LOT_SIZE,self.position + POSITION_LIMIT), Lifespan.FILL_AND_KILL)
+                self.asks.append(self.ask_id)
 
     def on_order_filled_message(self, client_order_id: int, price: int, volume: int) -> None:
         """Called when one of your orders is filled, partially or fully.
@@ -157,10 +186,10 @@ class AutoTrader(BaseAutoTrader):
 
         if client_order_id in self.bids:
             self.position += volume
-            self.send_hedge_order(next(self.order_ids), Side.ASK, MIN_BID_NEAREST_TICK, volume)
+            self.send_hedge_order(self._new_id(), Side.ASK, MIN_BID_NEAREST_TICK, volume)
         elif client_order_id in self.asks:
             self.position -= volume
-            self.send_hedge_order(next(self.order_ids), Side.BID, MAX_ASK_NEAREST_TICK, volume)
+            self.send_hedge_order(self._new_id(), Side.BID, MAX_ASK_NEAREST_TICK, volume)
 
     def on_order_status_message(self, client_order_id: int, fill_volume: int, remaining_volume: int,
                                 fees: int) -> None:
@@ -180,10 +209,6 @@ class AutoTrader(BaseAutoTrader):
             elif client_order_id == self.ask_id:
                 self.ask_id = 0
 
-            # It could be either a bid or an ask
-            self.bids.discard(client_order_id)
-            self.asks.discard(client_order_id)
-
     def on_trade_ticks_message(self, instrument: int, sequence_number: int, ask_prices: List[int],
                                ask_volumes: List[int], bid_prices: List[int], bid_volumes: List[int]) -> None:
         """Called periodically when there is trading activity on the market.
@@ -197,3 +222,43 @@ class AutoTrader(BaseAutoTrader):
         """
         self.logger.info("received trade ticks for instrument %d with sequence number %d", instrument,
                          sequence_number)
+
+
+
+
+#######  Custom functions/classes #######
+
+class Volatility():
+    """ Use a custom Ring Buffer to calculate the volatility of the last N returns. """
+    def __init__(self, size: int):
+        self.size = size
+        self.buffer = [0.0] * size
+        self.n = 0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, r: float) -> None:
+        """ Add a return to the buffer and update the running mean and M2 (Welford), as in test3. """
+        i = self.n % self.size
+        if self._count < self.size:
+            self._count += 1
+            delta = r - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (r - self._mean)
+        else:
+            # Replace the oldest return in the window
+            old = self.buffer[i]
+            new_mean = self._mean + (r - old) / self.size
+            self._m2 += (r - old) * (r - new_mean + old - self._mean)
+            self._mean = new_mean
+        self.buffer[i] = r
+        self.n += 1
+
+    def current_vol(self) -> float:
+        """ Return the standard deviation of the last N returns, scaled to the session. """
+        variance = max(self._m2, 0.0) / self._count
+        return math.sqrt(variance) * SESSION_VOL_SCALE
@@ -16,24 +16,50 @@
 #     License along with Ready Trader Go.  If not, see
 #     <https://www.gnu.org/licenses/>.
 import asyncio
-import itertools
 import collections
+import math
 import numpy as np
 
 from typing import List
 
 from ready_trader_go import BaseAutoTrader, Instrument, Lifespan, MAXIMUM_ASK, MINIMUM_BID, Side
 
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 LOT_SIZE = 10
 TICK_SIZE_IN_CENTS = 100
 MIN_BID_NEAREST_TICK = (MINIMUM_BID + TICK_SIZE_IN_CENTS) // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS
 MAX_ASK_NEAREST_TICK = MAXIMUM_ASK // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS
 END_TIME = 900
+INV_END_TIME = 1.0 / END_TIME
 TICK_INTERVAL = 0.25
 SPEED = 1
 BUFFER_SIZE = 100
 MIN_SIZE = 10
 
+
+# Compiled eagerly for this signature at import, so the first tick does not pay the JIT cost
+@njit("UniTuple(int64, 2)(int64, int64, float64, float64, float64, float64, int64)", cache=True, fastmath=True)
+def compute_quotes(mid, position, vol, T_minus_t, gamma, min_spread_pct, tick):
+    """ Return the Allevaneda and Stoikov (2007) bid and ask prices, rounded to the tick. """
+    v2 = vol * vol
+    reservation = mid - position * gamma * v2 * T_minus_t
+    opt_spread = gamma * v2 * T_minus_t + 2.0 * math.log(1.0 + gamma / 0.3) / gamma
+    min_spread = mid / 100.0 * min_spread_pct
+    half_spread = opt_spread * tick / 2.0
+
+    # Floor to whole cents once, then round to the tick with integer division
+    max_bid = math.floor(mid - min_spread / 2.0)
+    min_ask = math.floor(mid + min_spread / 2.0)
+    bid = math.floor(reservation - half_spread)
+    ask = math.floor(reservation + half_spread)
+    return min(max_bid // tick, bid // tick) * tick, max(min_ask // tick, ask // tick) * tick
+
+
 class AutoTrader(BaseAutoTrader):
     """Auto trader that implements the Allevaneda and Stoikov (2007) algorithm.
     """
@@ -41,18 +67,18 @@ class AutoTrader(BaseAutoTrader):
     def __init__(self, loop: asyncio.AbstractEventLoop, team_name: str, secret: str):
         """Initialise a new instance of the AutoTrader class."""
         super().__init__(loop, team_name, secret)
-        self.order_ids = itertools.count(1)
-        self.bids = set()
-        self.asks = set()
+        self._next_id = 0
         self.ask_id = self.ask_price = self.bid_id = self.bid_price = self.position = self.filled_position = 0
 
         # Initialize the variables for the time control
-        self.start = 0
-        self.time = 0
+        self._t0 = None
         self.now = 0
 
         # Initialize the variables for the volatility and bid/ask control 
-        self.mid_prices_future = self.returns_future = self.bid_prices = self.ask_prices =  np.array([])
+        self.mid_prices_future = np.empty(BUFFER_SIZE, dtype=np.int64)
+        self._mpf_n = 0
+        self.bid_prices = collections.deque(maxlen=BUFFER_SIZE)
+        self.ask_prices = collections.deque(maxlen=BUFFER_SIZE)
         self.volatility_indicator = Volatility(BUFFER_SIZE)
 
         # Position limit
@@ -62,6 +88,15 @@ class AutoTrader(BaseAutoTrader):
         self.gamma = 0.01
         self.min_spread_percent = 0.02
 
+        # Last quote inputs and the prices they produced
+        self._last_quote_key = None
+        self._last_quote = None
+
+    def _new_id(self) -> int:
+        """Return the next client order id."""
+        self._next_id += 1
+        return self._next_id
+
     def on_error_message(self, client_order_id: int, error_message: bytes) -> None:
         """Called when the exchange detects an error.
 
@@ -69,7 +104,7 @@ class AutoTrader(BaseAutoTrader):
         will identify that order, otherwise the client_order_id will be zero.
         """
         self.logger.warning("error with order %d: %s", client_order_id, error_message.decode())
-        if client_order_id != 0 and (client_order_id in self.bids or client_order_id in self.asks):
+        if client_order_id != 0 and (client_order_id == self.bid_id or client_order_id == self.ask_id):
             self.on_order_status_message(client_order_id, 0, 0, 0)
 
     def on_hedge_filled_message(self, client_order_id: int, price: int, volume: int) -> None:
@@ -92,100 +127,75 @@ class AutoTrader(BaseAutoTrader):
         price levels.
         """
         self.logger.info("received order book for instrument %d with sequence number %d", instrument,sequence_number)
-        self.logger.info(f"current position is {self.position}")
+        self.logger.info("current position is %d", self.position)
         if instrument == Instrument.FUTURE:
             # Calculate the time now
-            if self.start == 0:
-                self.start = self.event_loop.time()
+            if self._t0 is None:
+                self._t0 = self.event_loop.time()
                 self.now = TICK_INTERVAL
         
             # Update the time
             else:
-                self.time = self.event_loop.time()
-                self.now += (self.time - self.start) * SPEED
-                self.start = self.time
+                self.now = TICK_INTERVAL + (self.event_loop.time() - self._t0) * SPEED
+
+            self.logger.info("Time now: %s", self.now)
 
-            self.logger.info(f"Time now: {self.now}")
+            # Skip the update if one side of the book is empty, the mid price would be meaningless
+            if not ask_prices[0] or not bid_prices[0]:
+                return
 
             # Calculate the mid price for the Future
             mid_price_future = (ask_prices[0] + bid_prices[0]) // 2
 
-            # Add the mid price to the array
-            self.mid_prices_future = np.append(self.mid_prices_future,mid_price_future)
+            # Add the mid price to the ring buffer
+            self.mid_prices_future[self._mpf_n % BUFFER_SIZE] = mid_price_future
+            self._mpf_n += 1
 
             # Calculate the return for the Future if there are more than 1 mid prices
-            if self.mid_prices_future.shape[0] > 1:
-                return_future = np.log(self.mid_prices_future[-1]/self.mid_prices_future[-2])
-                self.volatility_indicator.buffer.append(return_future)
-                self.logger.info(f"mid price for the Future: {self.mid_prices_future[-1]}")
+            if self._mpf_n > 1:
+                previous_mid_price = self.mid_prices_future[(self._mpf_n - 2) % BUFFER_SIZE]
+                return_future = math.log(mid_price_future / previous_mid_price)
+                self.volatility_indicator.push(return_future)
+                self.logger.info("mid price for the Future: %d", mid_price_future)
             
             # Calculate the volatility for the Future if there are more than 20 returns
-            if len(self.volatility_indicator.buffer) >= MIN_SIZE:
+            if len(self.volatility_indicator) >= MIN_SIZE:
                 # Vol type I
                 # vol_future = np.std(self.returns_future) * np.sqrt(END_TIME * 4)
                 
                 # Vol type II
                 vol_future = self.volatility_indicator.current_vol() 
-                self.logger.info(f"volatility indicator: {vol_future}")
+                self.logger.info("volatility indicator: %s", vol_future)
 
-                # Calculate the reservation price for the Future
-                T_minus_t = (END_TIME - np.minimum(self.now,END_TIME)) / END_TIME
-                reservation_price = mid_price_future - self.position * self.gamma * (vol_future ** 2) * T_minus_t
-                self.logger.info(f"reservation price for the Future: {reservation_price}")
-                
-                # Optimal spread given by the theoretical model
-                optimal_spread = self.gamma * (vol_future ** 2) * T_minus_t + 2 * np.log(1 + self.gamma / 0.3) / self.gamma
-                min_spread = mid_price_future / 100 * self.min_spread_percent
-
-                # Calculate the bid price given by the theoretical model
-                max_limit_bid = mid_price_future - min_spread / 2
-                new_bid_price = min(int(max_limit_bid // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS),int((reservation_price - optimal_spread * TICK_SIZE_IN_CENTS  / 2) // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS))
-                self.bid_prices = np.append(self.bid_prices,new_bid_price)
-                # self.logger.info(f"max_limit_bid: {max_limit_bid}")
-                # self.logger.info(f"new bid price: {new_bid_price}")
-
-                # Calculate the ask price given by the theoretical model 
-                min_limit_ask = mid_price_future + min_spread / 2         
-                new_ask_price = max(int(min_limit_ask // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS),int((reservation_price + optimal_spread * TICK_SIZE_IN_CENTS / 2) // TICK_SIZE_IN_CENTS * TICK_SIZE_IN_CENTS))  
-                self.ask_prices = np.append(self.ask_prices,new_ask_price)
-                # self.logger.info(f"min_limit_ask: {min_limit_ask}")
-                # self.logger.info(f"new ask price: {new_ask_price}")
+                # Reuse the last quote if its inputs have not moved, and do nothing if it is already live
+                quote_key = (mid_price_future, self.position, int(vol_future * 1e4), int(self.now))
+                if quote_key == self._last_quote_key:
+                    new_bid_price, new_ask_price = self._last_quote
+                    if (self.bid_id != 0 and self.ask_id != 0
+                            and new_bid_price == self.bid_price and new_ask_price == self.ask_price):
+                        return
+
+                # Calculate the bid and ask prices given by the theoretical model
+                else:
+                    T_minus_t = max(0.0, 1.0 - self.now * INV_END_TIME)
+                    new_bid_price, new_ask_price = compute_quotes(mid_price_future, self.position, vol_future,
+                                                                  T_minus_t, self.gamma, self.min_spread_percent,
+                                                                  TICK_SIZE_IN_CENTS)
+                    self._last_quote_key = quote_key
+                    self._last_quote = (new_bid_price, new_ask_price)
+
+                self.bid_prices.append(new_bid_price)
+                self.ask_prices.append(new_ask_price)
                 
                 if self.bid_id != 0 and new_bid_price not in (self.bid_price, 0):
                     self.send_cancel_order(self.bid_id)
-                    self.logger.info(f"bid order {self.bid_id} cancelled")
+                    self.logger.info("bid order %d cancelled", self.bid_id)
 
                 if self.ask_id != 0 and new_ask_price not in (self.ask_price, 0):
                     self.send_cancel_order(self.ask_id)
-                    self.logger.info(f"ask order {self.ask_id} cancelled")
-
-
-                # Condition to send a new bid order
-                if self.bid_id == 0 and new_bid_price != 0 and self.position < self.position_limit:
-                    self.bid_id = next(self.order_ids)
-                    self.bid_price = new_bid_price
-                    
-                    if self.position == -self.position_limit:
-                        self.send_insert_order(self.bid_id, Side.BUY, new_bid_price,self.position_limit+50, Lifespan.GOOD_FOR_DAY)
-                        self.logger.info(f"bid order {self.bid_id} inserted at price {new_bid_price} for {self.position_limit+50} lots")
-                    else:
-                        self.send_insert_order(self.bid_id, Side.BUY, new_bid_price, np.minimum(LOT_SIZE*5,self.position_limit - self.position), Lifespan.GOOD_FOR_DAY)
-                        self.logger.info(f"bid order {self.bid_id} inserted at price {new_bid_price} for {np.minimum(LOT_SIZE*5,self.position_limit - self.position)} lots")
-                    self.bids.add(self.bid_id)
-
-                # Condition to send a new ask order
-                if self.ask_id == 0 and new_ask_price != 0 and self.position > -self.position_limit:
-                    self.ask_id = next(self.order_ids)
-                    self.ask_price = new_ask_price
-                    
-                    if self.position == self.position_limit:
-                        self.send_insert_order(self.ask_id, Side.SELL, new_ask_price,self.position_limit+50,Lifespan.GOOD_FOR_DAY)
-                        self.logger.info(f"ask order {self.ask_id} inserted at price {new_ask_price} for {self.position_limit+50} lots")
-
-                    else:
-                        self.send_insert_order(self.ask_id, Side.SELL, new_ask_price, np.minimum(LOT_SIZE*5,self.position + self.position_limit), Lifespan.GOOD_FOR_DAY)
-                        self.logger.info(f"ask order {self.ask_id} inserted at price {new_ask_price} for {np.minimum(LOT_SIZE*5,self.position + self.position_limit)} lots")
-                    self.asks.add(self.ask_id)
+                    self.logger.info("ask order %d cancelled", self.ask_id)
+
+                self._maybe_place_orders(new_bid_price, new_ask_price)
 
     def on_order_filled_message(self, client_order_id: int, price: int, volume: int) -> None:
         """Called when one of your orders is filled, partially or fully.
@@ -196,18 +206,18 @@ class AutoTrader(BaseAutoTrader):
         """
         self.logger.info("received order filled for order %d with price %d and volume %d", client_order_id,price, volume)
 
-        if client_order_id in self.bids:
+        if client_order_id == self.bid_id:
             self.position += volume
-            self.send_hedge_order(next(self.order_ids), Side.ASK,MIN_BID_NEAREST_TICK,volume)
+            self.send_hedge_order(self._new_id(), Side.ASK,MIN_BID_NEAREST_TICK,volume)
             self.send_cancel_order(client_order_id)
-            self.logger.info(f"ask order {client_order_id} cancelled")
+            self.logger.info("ask order %d cancelled", client_order_id)
             
 
-        elif client_order_id in self.asks:
+        elif client_order_id == self.ask_id:
             self.position -= volume
-            self.send_hedge_order(next(self.order_ids), Side.BID,MAX_ASK_NEAREST_TICK,volume)
+            self.send_hedge_order(self._new_id(), Side.BID,MAX_ASK_NEAREST_TICK,volume)
             self.send_cancel_order(client_order_id)
-            self.logger.info(f"ask order {client_order_id} cancelled")
+            self.logger.info("ask order %d cancelled", client_order_id)
 
     def on_order_status_message(self, client_order_id: int, fill_volume: int, remaining_volume: int,
                                 fees: int) -> None:
@@ -224,43 +234,43 @@ class AutoTrader(BaseAutoTrader):
         
         if remaining_volume == 0:
             if client_order_id == self.bid_id:
-                self.logger.info(f"cancel order {client_order_id} received (bid)")
+                self.logger.info("cancel order %d received (bid)", client_order_id)
                 self.bid_id = 0
             elif client_order_id == self.ask_id:
-                self.logger.info(f"cancel order {client_order_id} received (ask)")
+                self.logger.info("cancel order %d received (ask)", client_order_id)
                 self.ask_id = 0
             
             new_bid_price, new_ask_price = int(self.bid_prices[-1]), int(self.ask_prices[-1])
-            # Condition to send a new bid order
-            if self.bid_id == 0 and new_bid_price != 0 and self.position < self.position_limit:
-                self.bid_id = next(self.order_ids)
-                self.bid_price = new_bid_price
-                
-                if self.position == -self.position_limit:
-                    self.send_insert_order(self.bid_id, Side.BUY, new_bid_price,self.position_limit+50, Lifespan.GOOD_FOR_DAY)
-                    self.logger.info(f"bid order {self.bid_id} inserted at price {new_bid_price} for {self.position_limit+50} lots")
-                else:
-                    self.send_insert_order(self.bid_id, Side.BUY, new_bid_price, np.minimum(LOT_SIZE*5,self.position_limit - self.position), Lifespan.GOOD_FOR_DAY)
-                    self.logger.info(f"bid order {self.bid_id} inserted at price {new_bid_price} for {np.minimum(LOT_SIZE*5,self.position_limit - self.position)} lots")
-                self.bids.add(self.bid_id)
-
-            # Condition to send a new ask order
-            if self.ask_id == 0 and new_ask_price != 0 and self.position > -self.position_limit:
-                self.ask_id = next(self.order_ids)
-                self.ask_price = new_ask_price
-                
-                if self.position == self.position_limit:
-                    self.send_insert_order(self.ask_id, Side.SELL, new_ask_price,self.position_limit+50,Lifespan.GOOD_FOR_DAY)
-                    self.logger.info(f"ask order {self.ask_id} inserted at price {new_ask_price} for {self.position_limit+50} lots")
+            self._maybe_place_orders(new_bid_price, new_ask_price)
 
-                else:
-                    self.send_insert_order(self.ask_id, Side.SELL, new_ask_price, np.minimum(LOT_SIZE*5,self.position + self.position_limit), Lifespan.GOOD_FOR_DAY)
-                    self.logger.info(f"ask order {self.ask_id} inserted at price {new_ask_price} for {np.minimum(LOT_SIZE*5,self.position + self.position_limit)} lots")
-                self.asks.add(self.ask_id)
+    def _maybe_place_orders(self, new_bid_price: int, new_ask_price: int) -> None:
+        """Insert a new bid and/or ask order if there is no live order on that side.
 
-            # It could be either a bid or an ask
-            self.bids.discard(client_order_id)
-            self.asks.discard(client_order_id)
+        The volume is capped by the position limit, except when the position
+        is at the opposite limit, in which case a larger order is sent to
+        unwind it.
+        """
+        # Condition to send a new bid order
+        if self.bid_id == 0 and new_bid_price != 0 and self.position < self.position_limit:
+            self.bid_id = self._new_id()
+            self.bid_price = new_bid_price
+            if self.position == -self.position_limit:
+                lots = self.position_limit + 50
+            else:
+                lots = min(LOT_SIZE * 5, self.position_limit - self.position)
+            self.send_insert_order(self.bid_id, Side.BUY, new_bid_price, lots, Lifespan.GOOD_FOR_DAY)
+            self.logger.info("bid order %d inserted at price %d for %d lots", self.bid_id, new_bid_price, lots)
+
+        # Condition to send a new ask order
+        if self.ask_id == 0 and new_ask_price != 0 and self.position > -self.position_limit:
+            self.ask_id = self._new_id()
+            self.ask_price = new_ask_price
+            if self.position == self.position_limit:
+                lots = self.position_limit + 50
+            else:
+                lots = min(LOT_SIZE * 5, self.position + self.position_limit)
+            self.send_insert_order(self.ask_id, Side.SELL, new_ask_price, lots, Lifespan.GOOD_FOR_DAY)
+            self.logger.info("ask order %d inserted at price %d for %d lots", self.ask_id, new_ask_price, lots)
 
     def on_trade_ticks_message(self, instrument: int, sequence_number: int, ask_prices: List[int],
                                ask_volumes: List[int], bid_prices: List[int], bid_volumes: List[int]) -> None:
@@ -285,13 +295,38 @@ class Volatility():
     """ Use a custom Ring Buffer to calculate the volatility of the last N ticks. """
     def __init__(self, size: int):
         self.size = size
-        self.buffer = collections.deque(maxlen=size)
+        self.buffer = [0.0] * size
+        self.n = 0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
         self.vol = 0   
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, r: float) -> None:
+        """ Add a return to the buffer and update the running mean and M2 (Welford). """
+        i = self.n % self.size
+        if self._count < self.size:
+            self._count += 1
+            delta = r - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (r - self._mean)
+        else:
+            # Replace the oldest return in the window
+            old = self.buffer[i]
+            new_mean = self._mean + (r - old) / self.size
+            self._m2 += (r - old) * (r - new_mean + old - self._mean)
+            self._mean = new_mean
+        self.buffer[i] = r
+        self.n += 1
         
     def calculation(self) -> None:
         """ Calculate the volatility of the last N ticks. """
-        self.vol = np.sqrt(252 * 24 * 3600 * 4 * np.sum(np.square(self.buffer))/(len(self.buffer)-1))
+        variance = max(self._m2, 0.0) / (self._count - 1)
+        self.vol = math.sqrt(252 * 24 * 3600 * 4 * variance)
     
     def current_vol(self) -> float:
         self.calculation()
-        return self.vol
\ No newline at end of file
+        return self.vol
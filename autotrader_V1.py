@@ -18,12 +18,21 @@
 import asyncio
 import itertools
 import collections
+import logging
 import math
-import numpy as np
+
+from array import array
 
 from typing import List
 
 from ready_trader_go import BaseAutoTrader, Instrument, Lifespan, MAXIMUM_ASK, MINIMUM_BID, Side
+from ready_trader_go.messages import CANCEL_MESSAGE, CANCEL_MESSAGE_SIZE, HEADER, MessageType
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func
 
 LOT_SIZE = 10
 POSITION_LIMIT = 100
@@ -52,6 +61,36 @@ GAMMA = 0.01 # risk aversion
 KAPPA = 0.2 # order book liquidity parameter
 
 MAX_AGE_ORDER = 30 # maximum age of an order before it is cancelled
+MAX_ORDERS = 64 # initial number of rows of the outstanding orders table
+
+# the header Connection.send_message packs in front of every cancel, see send_cancel_orders
+CANCEL_HEADER = HEADER.pack(CANCEL_MESSAGE_SIZE, MessageType.CANCEL_ORDER)
+
+
+@njit("int64(int64)", cache=True)
+def floor_tick(price):
+    """Round an integer price in cents down to the tick grid."""
+    return (price // TICK_SIZE_IN_CENTS) * TICK_SIZE_IN_CENTS
+
+
+# Compiled eagerly for this signature at import, so the first tick does not pay the JIT cost
+@njit("UniTuple(int64, 4)(int64, int64, int64, int64, float64, float64, float64, int64, int64, int64, float64)",
+      cache=True, fastmath=True)
+def _quote(mid_price, best_bid, best_ask, position, sigma2, gamma, T_minus_t, tick, lot_size, pos_limit, spread_const):
+    """Return the Avellaneda-Stoikov bid and ask prices and the bid and ask volumes.
+    sigma2 is the variance sigma^2 of the mid price, so gamma * sigma2 * (T - t) is the
+    inventory term of both the reservation price and the optimal spread, in ticks:
+        r = s - q * gamma * sigma^2 * (T - t) * tick
+        delta = (2 * gamma * sigma^2 * (T - t) + 2 / gamma * log(1 + gamma / kappa)) * tick
+    with spread_const holding the second term of delta, already scaled to cents.
+    The bid is capped at the best bid and the ask floored at the best ask, so we never cross the book."""
+    variance_term = gamma * sigma2 * T_minus_t
+    res = mid_price - position * variance_term * tick
+    spread = 2 * variance_term * tick + spread_const
+    bid = min(floor_tick(math.floor(res - spread / 2)), best_bid)
+    ask = max(floor_tick(math.floor(res + spread / 2)), best_ask)
+    return bid, ask, min(lot_size, pos_limit - position), min(lot_size, pos_limit + position)
+
 
 class AutoTrader(BaseAutoTrader):
     """Example Auto-trader.
@@ -67,9 +106,7 @@ class AutoTrader(BaseAutoTrader):
         """Initialise a new instance of the AutoTrader class."""
         super().__init__(loop, team_name, secret)
         self.order_ids = itertools.count(1)
-        self.bids = set()
-        self.asks = set()
-        self.position = 0
+        self._order_side = {} # side of each of our live orders, by order id
         
         # about the current order books
         self.order_book_ETF = OrderBookCustom()
@@ -83,13 +120,34 @@ class AutoTrader(BaseAutoTrader):
         self.vol_is_calculated = False
         
         # to compute time to maturity
-        self.start = self.event_loop.time()
+        self._clock = self.event_loop.time
+        self.start = self._clock()
         self.now = self.start
         
         # for Avellaneda-Stoikov
-        self.sigma = 0.2
+        self.sigma2 = 0.2**2 # variance of the mid price, the only form the formulas use
         self.gamma = GAMMA
         self.kappa = KAPPA
+        self._spread_const = TICK_SIZE_IN_CENTS * 2 * math.log(1 + self.gamma/self.kappa)/self.gamma
+
+    def send_cancel_orders(self, client_order_ids) -> None:
+        """Cancel several orders at once.
+        Each cancel is framed as send_cancel_order would frame it, and the frames are
+        written to the exchange in a single write."""
+        # Connection has no batched send, so this writes to its private _connection_transport, the
+        # transport Connection.send_message writes to. If it is missing (not connected yet, connection
+        # lost, or renamed in the base class) fall back to the public per-order path.
+        transport = getattr(self, "_connection_transport", None)
+        if transport is None:
+            for order_id in client_order_ids:
+                self.send_cancel_order(order_id)
+            return
+        transport.write(b"".join(CANCEL_HEADER + CANCEL_MESSAGE.pack(order_id) for order_id in client_order_ids))
+
+    @property
+    def position(self) -> int:
+        """Return the current position, as tracked by the outstanding orders."""
+        return self.outstanding_orders.real_position
 
     def on_error_message(self, client_order_id: int, error_message: bytes) -> None:
         """Called when the exchange detects an error.
@@ -97,12 +155,17 @@ class AutoTrader(BaseAutoTrader):
         If the error pertains to a particular order, then the client_order_id
         will identify that order, otherwise the client_order_id will be zero.
         """
-        self.logger.info("on_error_message")
-        self.logger.warning("error with order %d: %s", client_order_id, error_message.decode())
-        self.logger.info("position: %d", self.position)
-        self.logger.info("theorical position: %d", self.outstanding_orders.get_theorical_position())
-        self.logger.info("real position: %d", self.outstanding_orders.get_real_position())
-        if client_order_id != 0 and (client_order_id in self.bids or client_order_id in self.asks):
+        logger = self.logger
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning("error with order %d: %s", client_order_id, error_message.decode('ascii', 'replace'))
+        if logger.isEnabledFor(logging.INFO):
+            oo = self.outstanding_orders
+            real_position = oo.get_real_position()
+            logger.info("on_error_message")
+            logger.info("position: %d", real_position)
+            logger.info("theorical position: %d", oo.get_theorical_position())
+            logger.info("real position: %d", real_position)
+        if client_order_id != 0 and client_order_id in self._order_side:
             self.on_order_status_message(client_order_id, 0, 0, 0)
 
     def on_hedge_filled_message(self, client_order_id: int, price: int, volume: int) -> None:
@@ -124,60 +187,58 @@ class AutoTrader(BaseAutoTrader):
         prices are reported along with the volume available at each of those
         price levels.
         """
+        oo = self.outstanding_orders
+        position = oo.get_real_position()
         self.logger.info("on_order_book_update_message")
-        self.logger.info(f'instrument: {instrument}, sequence number: {sequence_number}, mid price: {(ask_prices[0] + bid_prices[0]) / 2} \n bid prices: {bid_prices} \n bid volumes: {bid_volumes}  \n ask prices: {ask_prices} \n ask volumes: {ask_volumes}')
-        self.logger.info("position: %d", self.position)
-        self.logger.info("theorical position: %d", self.outstanding_orders.get_theorical_position())
-        self.logger.info("real position: %d", self.outstanding_orders.get_real_position())
+        self.logger.info('instrument: %d, sequence number: %d, mid price: %s \n bid prices: %s \n bid volumes: %s  \n ask prices: %s \n ask volumes: %s',
+                         instrument, sequence_number, (ask_prices[0] + bid_prices[0]) / 2, bid_prices, bid_volumes,
+                         ask_prices, ask_volumes)
+        self.logger.info("position: %d", position)
+        self.logger.info("theorical position: %d", oo.get_theorical_position())
+        self.logger.info("real position: %d", position)
         if instrument == 0 and sequence_number == 1:
-            self.start = self.event_loop.time()
+            self.start = self._clock()
         
         if instrument == Instrument.FUTURE and sequence_number > 1:
+            # Skip the update if one side of the book is empty, the mid price would be meaningless
+            if not ask_prices[0] or not bid_prices[0]:
+                return
             
             #update the order book
             #self.order_book_Future.update(ask_prices, ask_volumes, bid_prices, bid_volumes)               
                    
-            self.now = (self.event_loop.time()-self.start)*SPEED
-            T_minus_t = (END_TIME - self.now) / END_TIME
-            self.logger.info("volatility: %f, now: %f, T_minus_t: %f", self.sigma, self.now, T_minus_t)
-            position = self.outstanding_orders.get_real_position()
+            now = self.now = (self._clock() - self.start) * SPEED
+            T_minus_t = (END_TIME - now) / END_TIME
+            self.logger.info("variance: %f, now: %f, T_minus_t: %f", self.sigma2, now, T_minus_t)
             
             # avellaneda-stoikov
-            mid_price = (ask_prices[0] + bid_prices[0]) / 2
-            gamma_sigma2_T_minus_t = self.gamma * self.sigma**2 * T_minus_t
-            reservation_price = mid_price - position * gamma_sigma2_T_minus_t * TICK_SIZE_IN_CENTS
-            optimal_spread = gamma_sigma2_T_minus_t + TICK_SIZE_IN_CENTS * 2 * np.log(1 + self.gamma/self.kappa)/self.gamma
-            self.logger.info("mid price:%d, reservation price:%d, optimal spread:%d", mid_price, reservation_price, optimal_spread)
-            
-            # compute new bid and ask prices
-            #new_bid_price = math.floor((reservation_price - optimal_spread / 2) / TICK_SIZE_IN_CENTS) * TICK_SIZE_IN_CENTS
-            #new_ask_price = math.ceil((reservation_price + optimal_spread / 2) / TICK_SIZE_IN_CENTS) * TICK_SIZE_IN_CENTS
-            max_bid = int((mid_price - TICK_SIZE_IN_CENTS) // TICK_SIZE_IN_CENTS) * TICK_SIZE_IN_CENTS
-            bid_price = int((reservation_price - optimal_spread / 2) // TICK_SIZE_IN_CENTS) * TICK_SIZE_IN_CENTS
-            new_bid_price = np.minimum(bid_price, max_bid)
-            lot_size_bid = np.minimum(LOT_SIZE, POSITION_LIMIT - self.outstanding_orders.get_real_position())
-            
-            min_ask = int((mid_price + TICK_SIZE_IN_CENTS) // TICK_SIZE_IN_CENTS) * TICK_SIZE_IN_CENTS
-            ask_prices = int((reservation_price + optimal_spread / 2) // TICK_SIZE_IN_CENTS) * TICK_SIZE_IN_CENTS
-            new_ask_price = np.maximum(ask_prices, min_ask)
-            lot_size_ask = np.minimum(LOT_SIZE, self.outstanding_orders.get_real_position() + POSITION_LIMIT)
+            mid_price = (ask_prices[0] + bid_prices[0]) >> 1
+            new_bid_price, new_ask_price, lot_size_bid, lot_size_ask = _quote(
+                mid_price, bid_prices[0], ask_prices[0], position, self.sigma2, self.gamma, T_minus_t, TICK_SIZE_IN_CENTS,
+                LOT_SIZE, POSITION_LIMIT, self._spread_const)
+            self.logger.info("mid price:%d, bid price:%d, ask price:%d", mid_price, new_bid_price, new_ask_price)
                         
-            if self.outstanding_orders.can_we_bid():
-                bid_id = next(self.order_ids)                                
-                self.outstanding_orders.add_order(self.now, bid_id, Side.BUY, new_bid_price, lot_size_bid)
-                self.send_insert_order(bid_id, Side.BUY, new_bid_price, lot_size_bid, Lifespan.GOOD_FOR_DAY)
+            insert = self.send_insert_order
+            next_id = self.order_ids.__next__
+            add_order = oo.add_order
+            order_side = self._order_side
+            
+            if oo.can_we_bid():
+                bid_id = next_id()                                
+                add_order(now, bid_id, Side.BUY, new_bid_price, lot_size_bid)
+                insert(bid_id, Side.BUY, new_bid_price, lot_size_bid, Lifespan.GOOD_FOR_DAY)
                 
-                self.bids.add(bid_id)
+                order_side[bid_id] = Side.BUY
                 
                 self.logger.info("new bid %d with price %d, volume: %d", bid_id, new_bid_price, lot_size_bid)
             
-            if self.outstanding_orders.can_we_ask():
-                ask_id = next(self.order_ids)               
+            if oo.can_we_ask():
+                ask_id = next_id()               
                 
-                self.outstanding_orders.add_order(self.now, ask_id, Side.SELL, new_ask_price, lot_size_ask)
-                self.send_insert_order(ask_id, Side.SELL, new_ask_price, lot_size_ask, Lifespan.GOOD_FOR_DAY)
+                add_order(now, ask_id, Side.SELL, new_ask_price, lot_size_ask)
+                insert(ask_id, Side.SELL, new_ask_price, lot_size_ask, Lifespan.GOOD_FOR_DAY)
                 
-                self.asks.add(ask_id)
+                order_side[ask_id] = Side.SELL
                 
                 self.logger.info("new ask %d with price %d, volume: %d", ask_id, new_ask_price, lot_size_ask)
         
@@ -199,19 +260,20 @@ class AutoTrader(BaseAutoTrader):
                          price, volume)
         self.send_cancel_order(client_order_id)
         
-        if client_order_id in self.bids:
-            self.position += volume
+        side = self._order_side.get(client_order_id)
+        if side == Side.BUY:
             self.send_hedge_order(next(self.order_ids), Side.ASK, MIN_BID_NEAREST_TICK, volume)
-        elif client_order_id in self.asks:
-            self.position -= volume
+        elif side == Side.SELL:
             self.send_hedge_order(next(self.order_ids), Side.BID, MAX_ASK_NEAREST_TICK, volume)
 
         
-        self.logger.info(str(self.outstanding_orders))
-        self.outstanding_orders.is_filled(client_order_id,volume)
-        self.logger.info("position: %d", self.position)
-        self.logger.info("theorical class: %d", self.outstanding_orders.get_theorical_position())
-        self.logger.info("real class: %d", self.outstanding_orders.get_real_position())
+        oo = self.outstanding_orders
+        self.logger.debug("%s", oo)
+        oo.is_filled(client_order_id,volume)
+        real_position = oo.get_real_position()
+        self.logger.info("position: %d", real_position)
+        self.logger.info("theorical class: %d", oo.get_theorical_position())
+        self.logger.info("real class: %d", real_position)
         self.logger.info("-------------------")
         
     def on_order_status_message(self, client_order_id: int, fill_volume: int, remaining_volume: int,
@@ -228,14 +290,19 @@ class AutoTrader(BaseAutoTrader):
         self.logger.info("on_order_status_message")
         self.logger.info("received order status for order %d with fill volume %d remaining %d and fees %d",
                          client_order_id, fill_volume, remaining_volume, fees)
-        self.logger.info("position: %d", self.position)
-        self.logger.info("theorical position: %d", self.outstanding_orders.get_theorical_position())
-        self.logger.info("real position: %d", self.outstanding_orders.get_real_position())
-        self.outstanding_orders.update_order(client_order_id, fill_volume, remaining_volume)
-        self.logger.info(str(self.outstanding_orders))
-        self.logger.info("position: %d", self.position)
-        self.logger.info("theorical position: %d", self.outstanding_orders.get_theorical_position())
-        self.logger.info("real position: %d", self.outstanding_orders.get_real_position())
+        oo = self.outstanding_orders
+        real_position = oo.get_real_position()
+        self.logger.info("position: %d", real_position)
+        self.logger.info("theorical position: %d", oo.get_theorical_position())
+        self.logger.info("real position: %d", real_position)
+        oo.update_order(client_order_id, fill_volume, remaining_volume)
+        if remaining_volume == 0:
+            self._order_side.pop(client_order_id, None)
+        self.logger.debug("%s", oo)
+        # a status update never changes the real position, only the theorical one
+        self.logger.info("position: %d", real_position)
+        self.logger.info("theorical position: %d", oo.get_theorical_position())
+        self.logger.info("real position: %d", real_position)
         self.logger.info("-------------------")
 
     def on_trade_ticks_message(self, instrument: int, sequence_number: int, ask_prices: List[int],
@@ -250,16 +317,18 @@ class AutoTrader(BaseAutoTrader):
         the end of both the prices and volumes arrays.
         """
         self.logger.info("on_trade_ticks_message")
-        self.logger.info(f'instrument: {instrument}, sequence number: {sequence_number}, mid price: {(ask_prices[0] + bid_prices[0]) / 2} \n bid prices: {bid_prices} \n bid volumes: {bid_volumes}  \n ask prices: {ask_prices} \n ask volumes: {ask_volumes}')
+        self.logger.info('instrument: %d, sequence number: %d, mid price: %s \n bid prices: %s \n bid volumes: %s  \n ask prices: %s \n ask volumes: %s',
+                         instrument, sequence_number, (ask_prices[0] + bid_prices[0]) / 2, bid_prices, bid_volumes,
+                         ask_prices, ask_volumes)
         
         if instrument == Instrument.ETF:      
             to_cancel = self.outstanding_orders.to_cancel(bid_prices, ask_prices)
-            for order_id in to_cancel:
-                self.send_cancel_order(order_id)
+            if to_cancel:
+                self.send_cancel_orders(to_cancel)
         elif instrument == Instrument.FUTURE:
             mid_price = (ask_prices[0] + bid_prices[0]) / 2
             self.volatility_indicator.add_sample(mid_price)
-            self.sigma = self.volatility_indicator.current_vol()  
+            self.sigma2 = self.volatility_indicator.current_variance()  
 
             
                 
@@ -292,19 +361,15 @@ class OrderBookCustom:
         
         # determine the last traded price knowing that bid prices are sorted in descending order and ask prices in ascending order
         # it determines if a price disappear or a volume change
-        for i in range(len(self.__ask_prices)):
-            if self.__ask_prices[i] not in ask_prices:
-                self.__last_traded_price = self.__ask_prices[i]
-                break
-            if self.__ask_volumes[i] != ask_volumes[ask_prices.index(self.__ask_prices[i])]:
-                self.__last_traded_price = self.__ask_prices[i]
+        new_ask = dict(zip(ask_prices, ask_volumes))
+        for price, volume in zip(self.__ask_prices, self.__ask_volumes):
+            if new_ask.get(price) != volume:
+                self.__last_traded_price = price
                 break
-        for i in range(len(self.__bid_prices)):
-            if self.__bid_prices[i] not in bid_prices:
-                self.__last_traded_price = self.__bid_prices[i]
-                break
-            if self.__bid_volumes[i] != bid_volumes[bid_prices.index(self.__bid_prices[i])]:
-                self.__last_traded_price = self.__bid_prices[i]
+        new_bid = dict(zip(bid_prices, bid_volumes))
+        for price, volume in zip(self.__bid_prices, self.__bid_volumes):
+            if new_bid.get(price) != volume:
+                self.__last_traded_price = price
                 break
         
         self.__mid_price = (ask_prices[0] + bid_prices[0]) / 2
@@ -328,43 +393,116 @@ class VolatilityIndicator():
     """ Use a custom Ring Buffer to calculate the volatility of the last N ticks. """
     def __init__(self):
         self.buffer = collections.deque(maxlen=BUFFER_VOLATILITY_SIZE)
-        self.volatility = 0.25
+        self.variance = 0.25**2
         self.min_size = MIN_TO_COMPUTE_VOLATILITY
+        
+        # rolling sums of the log-returns of the buffer
+        self._logrets = collections.deque(maxlen=BUFFER_VOLATILITY_SIZE-1)
+        self._logret_sum = 0.0
+        self._logret_sqsum = 0.0
+        self._prev_log = None
 
     def add_sample(self, sample: float):
-        if sample != 0: self.buffer.append(sample)
+        if sample != 0:
+            self.buffer.append(sample)
+            log_sample = math.log(sample)
+            if self._prev_log is not None:
+                r = log_sample - self._prev_log
+                if len(self._logrets) == self._logrets.maxlen:
+                    r_old = self._logrets[0]
+                    self._logret_sum -= r_old
+                    self._logret_sqsum -= r_old * r_old
+                self._logrets.append(r)
+                self._logret_sum += r
+                self._logret_sqsum += r * r
+            self._prev_log = log_sample
+            
+    def bulk_load(self, prices):
+        """ Load a whole price series at once, e.g. to warm up from historical ticks.
+        Return the volatility of every full window of the series, see volatility_bulk.bulk_load."""
+        from volatility_bulk import bulk_load
+        return bulk_load(self, prices)
             
     def calculation(self) -> None:
-        """ Calculate the volatility"""
+        """ Calculate the variance of the log-returns"""
         if len(self.buffer) > self.min_size: 
-            self.volatility = np.sqrt(np.sum(np.square(np.log(np.array(self.buffer)[:-1]) - np.log(np.array(self.buffer)[1:])))/(len(self.buffer)-1))
+            n = len(self._logrets)
+            var = (self._logret_sqsum - self._logret_sum**2 / n) / (n - 1)
+            self.variance = max(var, 0.0)
     
-    def current_vol(self) -> float:
+    def current_variance(self) -> float:
         self.calculation()
-        return self.volatility
+        return self.variance
+    
+    def current_vol(self) -> float:
+        return math.sqrt(self.current_variance())
     
         
 class OutsandingOrders():
-    """Keep track of my outstanding orders."""    
+    """Keep track of my outstanding orders.
+    Orders are stored column-wise in typed arrays, one row per order, with a
+    dictionary from order id to row and a stack of free rows."""    
     def __init__(self) -> None:
         self.theorical_position = 0 # theorical curent position should not exceed 100 or -100
         self.real_position = 0 # real position
         self.active_orders : int = 0 # number of active orders should no be more than 10
-        self.orders =  collections.defaultdict(int) # dictionary of all orders
+        
+        # table of all orders
+        self.ids = array('q', [0]) * MAX_ORDERS
+        self.times = array('d', [0.0]) * MAX_ORDERS
+        self.sides = array('b', [0]) * MAX_ORDERS
+        self.prices = array('q', [0]) * MAX_ORDERS
+        self.volumes = array('i', [0]) * MAX_ORDERS
+        self.live = array('B', [0]) * MAX_ORDERS
+        self._row_of = {}
+        self._free = list(range(MAX_ORDERS - 1, -1, -1))
+        self._used = 0 # rows above this one have never been used
+        self._cancel_scratch = collections.deque() # reused by to_cancel, valid until the next call
+    
+    def _grow(self) -> None:
+        """Double the number of rows of the table."""
+        size = len(self.ids)
+        self.ids.extend(array('q', [0]) * size)
+        self.times.extend(array('d', [0.0]) * size)
+        self.sides.extend(array('b', [0]) * size)
+        self.prices.extend(array('q', [0]) * size)
+        self.volumes.extend(array('i', [0]) * size)
+        self.live.extend(array('B', [0]) * size)
+        self._free.extend(range(2 * size - 1, size - 1, -1))
+    
+    def _release(self, order_id: int) -> int:
+        """Remove an order from the table and return its row."""
+        row = self._row_of.pop(order_id)
+        self.live[row] = 0
+        self._free.append(row)
+        return row
     
     def add_order(self, time: float, order_id: int, side: int, price: int, volume: int) -> None:
-        """Add an order to the dictionary of orders.
+        """Add an order to the table of orders.
         if side is 1 it's a bid and if it's 0 it's an ask."""
         if side == Side.BID:
             self.theorical_position += volume
         else:
             self.theorical_position -= volume
-        self.orders[order_id] = [time, side, price, volume]
+        if not self._free:
+            self._grow()
+        row = self._free.pop()
+        self.ids[row] = order_id
+        self.times[row] = time
+        self.sides[row] = side
+        self.prices[row] = price
+        self.volumes[row] = volume
+        self.live[row] = 1
+        self._row_of[order_id] = row
+        self._used = max(self._used, row + 1)
         self.active_orders += 1
     
     def is_filled(self, order_id: int, volume: int) -> bool:
         """Change the postiton when an order is filled."""
-        if self.orders[order_id][1] == Side.BID:
+        row = self._row_of.get(order_id)
+        if row is None: # unknown or already removed order
+            return
+        if self.sides[row] == Side.BID:
             self.real_position += volume
         else:
             self.real_position -= volume            
@@ -374,20 +512,22 @@ class OutsandingOrders():
          The fill_volume is the number of lots already traded, remaining_volume
         is the number of lots yet to be traded
         """
+        if client_order_id not in self._row_of: # unknown or already removed order
+            return
         if fill_volume == 0 and remaining_volume == 0: # the order was rejected
             self.active_orders -= 1
-            if self.orders[client_order_id][1] == Side.BID:
-                self.theorical_position -= self.orders[client_order_id][3]
+            row = self._release(client_order_id)
+            if self.sides[row] == Side.BID:
+                self.theorical_position -= int(self.volumes[row])
             else:
-                self.theorical_position += self.orders[client_order_id][3]
-            del self.orders[client_order_id]
+                self.theorical_position += int(self.volumes[row])
         elif fill_volume == 0: # we already add this order when it was created
             pass 
         elif remaining_volume == 0: # we add to delete this order
             self.active_orders -= 1
-            del self.orders[client_order_id]
+            self._release(client_order_id)
         else: # we update the volume of the position
-            self.orders[client_order_id][3] = remaining_volume
+            self.volumes[self._row_of[client_order_id]] = remaining_volume
     
     def can_we_bid(self):
         """Return True if we can bid, False otherwise and return the volume we can bid."""
@@ -415,17 +555,27 @@ class OutsandingOrders():
         """Return the number of active orders."""
         return self.active_orders
     
-    def to_cancel(self, bid_prices, ask_prices) -> List[int]:
-        """ If order are not in the top 5 bids or top 5 asks we return a list of order ids to cancel"""
-        to_cancel = []
-        for order_id in self.orders:
-            if (self.orders[order_id][2] not in bid_prices) or (self.orders[order_id][2] not in ask_prices):
-                to_cancel.append(order_id)
-        return to_cancel
+    def to_cancel(self, bid_prices, ask_prices) -> collections.deque:
+        """ If a bid is not in the top 5 bids or an ask not in the top 5 asks we return the order ids to cancel.
+        The same deque is returned on every call, so it must be consumed before calling again."""
+        bidset = frozenset(bid_prices)
+        askset = frozenset(ask_prices)
+        sides = self.sides
+        prices = self.prices
+        live = self.live
+        ids = self.ids
+        scratch = self._cancel_scratch
+        scratch.clear()
+        for row in range(self._used):
+            if live[row] and prices[row] not in (bidset if sides[row] == Side.BID else askset):
+                scratch.append(ids[row])
+        return scratch
     
     def __str__(self) -> str:
         """Return a string representation of the outstanding orders."""
-        return f'theorical positions: {self.theorical_position}, real positions: {self.theorical_position} \n active orders: {self.active_orders} \n orders: {self.orders} \n'
+        orders = {order_id: [float(self.times[row]), int(self.sides[row]), int(self.prices[row]), int(self.volumes[row])]
+                  for order_id, row in self._row_of.items()}
+        return f'theorical positions: {self.theorical_position}, real positions: {self.theorical_position} \n active orders: {self.active_orders} \n orders: {orders} \n'
         
                  
         
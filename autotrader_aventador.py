@@ -16,16 +16,25 @@
 #     License along with Ready Trader Go.  If not, see
 #     <https://www.gnu.org/licenses/>.
 import asyncio
-import itertools
+import atexit
 import collections
+import logging
+import queue
 import numpy as np
-from math import ceil, floor
-from scipy.optimize import curve_fit
+from array import array
+from logging.handlers import QueueHandler, QueueListener
+from math import floor, log, log1p, sqrt
 
 from typing import List
 
 from ready_trader_go import BaseAutoTrader, Instrument, Lifespan, MAXIMUM_ASK, MINIMUM_BID, Side
 
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 
 # about time
 SPEED = 1
@@ -60,10 +69,67 @@ KAPPA = 0.4 # order book depth parameter
 
 ORDER_OPTIMIZATION_ENABLED = False #Allows the bid and ask order prices to be adjusted based on the current top bid and ask prices in the market
 PRICE_QUANTUM = 1 #The minimum price increment that the bid and ask prices can be adjusted by above and below the current top bid and ask prices in the market
+PRICE_QUANTUM_TICKS = PRICE_QUANTUM * TICK_SIZE_IN_CENTS # the same increment in cents
 MIN_SPREAD_PCT = 0.4 # minimum spread in function of the mid price as a percentage
 #MAX_SPREAD = 5 # maximum spread in function of the mid price as a percentage
 
 
+# Compiled eagerly for this signature at import, so the first tick does not pay the JIT cost
+@njit("UniTuple(int64, 2)(float64, int64, float64, float64, float64, int64, float64, int64, int64, boolean, int64)",
+      cache=True, fastmath=True)
+def _quote(mid_price, position, gamma_sigma2, spread_const, T_minus_t, tick, half_min_spread_coef, best_bid, best_ask,
+           optimization_enabled, price_quantum_ticks):
+    """Return the Avellaneda-Stoikov bid and ask prices, rounded down to the tick.
+    gamma_sigma2 is gamma * sigma^2, spread_const is 2 / gamma * log(1 + gamma / kappa) and
+    half_min_spread_coef is half the minimum spread as a fraction of the mid price.
+    The bid is at most and the ask at least half the minimum spread away from the mid price,
+    and with order optimization they are also kept within price_quantum_ticks cents of the best bid and ask."""
+    reservation_price = mid_price - position * gamma_sigma2 * T_minus_t * tick
+    optimal_spread = gamma_sigma2 * T_minus_t + spread_const
+    optimal_spread *= tick
+    half_min_spread = mid_price * half_min_spread_coef
+    
+    # we compute the new bid and ask prices, flooring to whole cents once and then to the tick with integer division
+    bid_avellaneda = floor(reservation_price - optimal_spread/2) // tick * tick
+    ask_avellaneda = floor(reservation_price + optimal_spread/2) // tick * tick
+    
+    # we compute the max bid and ask prices
+    max_bid_price = floor(mid_price - half_min_spread) // tick * tick
+    min_ask_price = floor(mid_price + half_min_spread) // tick * tick
+    
+    # new bid and ask prices
+    new_bid_price = min(max_bid_price, bid_avellaneda)
+    new_ask_price = max(min_ask_price, ask_avellaneda)
+    
+    # we adjust the bid and ask prices
+    if optimization_enabled:
+        price_above_bid = best_bid + price_quantum_ticks
+        price_below_ask = best_ask - price_quantum_ticks
+        if new_bid_price > price_above_bid:
+            new_bid_price = price_above_bid
+        if new_ask_price < price_below_ask:
+            new_ask_price = price_below_ask
+    return new_bid_price, new_ask_price
+
+
+_log_listener = None # the one QueueListener of the process, once logging has been moved off the event loop
+
+
+def _log_off_thread() -> None:
+    """ Put the root logger's handlers behind a queue drained by a background thread,
+    so the logging calls in the callbacks do not write to the log file on the event loop.
+    Only the first call has an effect."""
+    global _log_listener
+    root = logging.getLogger()
+    if _log_listener is not None or not root.handlers:
+        return
+    log_queue = queue.SimpleQueue()
+    _log_listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(log_queue)]
+    _log_listener.start()
+    atexit.register(_log_listener.stop) # flush what is left in the queue at shutdown
+
+
 class AutoTrader(BaseAutoTrader):
     """Example Auto-trader.
 
@@ -77,10 +143,9 @@ class AutoTrader(BaseAutoTrader):
     def __init__(self, loop: asyncio.AbstractEventLoop, team_name: str, secret: str):
         """Initialise a new instance of the AutoTrader class."""
         super().__init__(loop, team_name, secret)
-        self.order_ids = itertools.count(1)
-        self.bids = set()
-        self.asks = set()
+        self._next_id = 0
         self.ask_id = self.ask_price = self.bid_id = self.bid_price = self.position = 0
+        self.ask_cancel_id = self.bid_cancel_id = 0 # last order we sent a cancel for on each side
         
         # to compute time to maturity
         self.start = self.event_loop.time()
@@ -89,21 +154,41 @@ class AutoTrader(BaseAutoTrader):
         # about indicators
         self.volatility_indicator = VolatilityIndicator()
         self.kappa_indicator = KappaIndicator()
-        self.treshold_sigma_max = TRESHOLD_SIGMA_MAX
-        self.treshold_sigma_min = TRESHOLD_SIGMA_MIN
+        # compared against the variance, so squared once here
+        self.treshold_sigma2_max = TRESHOLD_SIGMA_MAX**2
+        self.treshold_sigma2_min = TRESHOLD_SIGMA_MIN**2
         
         # for Avellaneda-Stoikov
-        self.sigma = SIGMA
+        self.sigma2 = SIGMA**2 # only the variance appears in the formulas
         self.gamma = GAMMA
         self.kappa = KAPPA
+        self._spread_const = 2 * log1p(self.gamma/self.kappa)/self.gamma
         
         # about orders
         self.order_optimization_enabled = ORDER_OPTIMIZATION_ENABLED
         self.last_etf_best_bid = 0
         self.last_etf_best_ask = 10**9
         self.min_spread_pct = MIN_SPREAD_PCT
+        self._half_min_spread_coef = self.min_spread_pct / 200 # percentage to a fraction, halved
         
         
+    def _new_id(self) -> int:
+        """Return the next client order id."""
+        self._next_id += 1
+        return self._next_id
+
+    def _set_kappa(self, kappa: float) -> None:
+        """Set kappa, and recompute the spread constant only if it actually changed."""
+        if kappa != self.kappa:
+            self.kappa = kappa
+            self._spread_const = 2 * log1p(self.gamma/kappa)/self.gamma
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Called when the execution connection and the information channel are established.
+        Once the trader is actually running, logging is moved off the event loop."""
+        super().connection_made(transport)
+        _log_off_thread()
+
     def on_error_message(self, client_order_id: int, error_message: bytes) -> None:
         """Called when the exchange detects an error.
 
@@ -111,7 +196,7 @@ class AutoTrader(BaseAutoTrader):
         will identify that order, otherwise the client_order_id will be zero.
         """
         self.logger.warning("error with order %d: %s", client_order_id, error_message.decode())
-        if client_order_id != 0 and (client_order_id in self.bids or client_order_id in self.asks):
+        if client_order_id != 0 and (client_order_id == self.bid_id or client_order_id == self.ask_id):
             self.on_order_status_message(client_order_id, 0, 0, 0)
 
     def on_hedge_filled_message(self, client_order_id: int, price: int, volume: int) -> None:
@@ -134,7 +219,10 @@ class AutoTrader(BaseAutoTrader):
         price levels.
         """
         #self.logger.info("received order book for instrument %d with sequence number %d", instrument, sequence_number)
-        self.logger.info(f'instrument: {instrument}, sequence number: {sequence_number}, mid price: {(ask_prices[0] + bid_prices[0]) / 2} \n bid prices: {bid_prices} \n bid volumes: {bid_volumes}  \n ask prices: {ask_prices} \n ask volumes: {ask_volumes}')
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info('instrument: %d, sequence number: %d, mid price: %s \n bid prices: %s \n bid volumes: %s  \n ask prices: %s \n ask volumes: %s',
+                             instrument, sequence_number, (ask_prices[0] + bid_prices[0]) / 2, bid_prices, bid_volumes,
+                             ask_prices, ask_volumes)
 
         
         if instrument == Instrument.FUTURE and sequence_number == 1:
@@ -142,86 +230,65 @@ class AutoTrader(BaseAutoTrader):
             
         if instrument == Instrument.FUTURE and sequence_number > 1:
             
+            # Skip the update if one side of the book is empty, the mid price would be meaningless
+            if not ask_prices[0] or not bid_prices[0]:
+                return
+            
             # new mid price
             self.mid_price = (ask_prices[0] + bid_prices[0]) / 2
             
-            # we compute the volatility
-            self.sigma = self.volatility_indicator.current_volatility()
+            # we compute the variance
+            self.sigma2 = self.volatility_indicator.current_variance()
             
             # we compute the time to maturity
             self.now = (self.event_loop.time()-self.start)*SPEED
             T_minus_t = (END_TIME - self.now) / END_TIME
             
-            self.logger.info("mid price, volatility, kappa, time to maturity, position: %d, %f, %f, %f, %d", self.mid_price, self.sigma, self.kappa, T_minus_t, self.position)
+            self.logger.info("mid price, variance, kappa, time to maturity, position: %d, %f, %f, %f, %d", self.mid_price, self.sigma2, self.kappa, T_minus_t, self.position)
             
             # Avellaneda-Stoikov
-            reservation_price = self.mid_price - self.position * self.gamma * self.sigma**2 * T_minus_t * TICK_SIZE_IN_CENTS
-            optimal_spread = self.gamma * self.sigma**2 * T_minus_t + 2 * np.log(1 + self.gamma/self.kappa)/self.gamma
-            optimal_spread *= TICK_SIZE_IN_CENTS
-            min_spread = self.mid_price / 100 * self.min_spread_pct
-            #self.logger.info("reservation price: %d, optimal spread: %d, min spread: %d", reservation_price, optimal_spread, min_spread)
-            
-            # we compute the new bid and ask prices
-            bid_avellaneda = int((reservation_price - optimal_spread/2) // TICK_SIZE_IN_CENTS) * TICK_SIZE_IN_CENTS
-            ask_avellaneda = int((reservation_price + optimal_spread/2) // TICK_SIZE_IN_CENTS) * TICK_SIZE_IN_CENTS
-            #self.logger.info("bid avellaneda: %d, ask avellaneda: %d", bid_avellaneda, ask_avellaneda)
-            
-            # we compute the max bid and ask prices
-            max_bid_price = int((self.mid_price - min_spread/2) // TICK_SIZE_IN_CENTS) * TICK_SIZE_IN_CENTS
-            min_ask_price = int((self.mid_price + min_spread/2) // TICK_SIZE_IN_CENTS) * TICK_SIZE_IN_CENTS
-            #self.logger.info("max bid price: %d, min ask price: %d", max_bid_price, min_ask_price)
-            
-            # new bid and ask prices
-            new_bid_price = min(max_bid_price, bid_avellaneda)
-            new_ask_price = max(min_ask_price, ask_avellaneda)
-            #self.logger.info("new bid price: %d, new ask price: %d", new_bid_price, new_ask_price)
-            
-            # we adjust the bid and ask prices
-            if self.order_optimization_enabled:
-                price_above_bid = bid_prices[0] + PRICE_QUANTUM * TICK_SIZE_IN_CENTS
-                price_below_ask = ask_prices[0] - PRICE_QUANTUM * TICK_SIZE_IN_CENTS
-                if new_bid_price > price_above_bid:
-                    new_bid_price = price_above_bid
-                if new_ask_price < price_below_ask:
-                    new_ask_price = price_below_ask
-                #self.logger.info("after optimization bid: %d, ask: %d", new_bid_price, new_ask_price)
-
-            if self.bid_id != 0 and new_bid_price not in (self.bid_price, 0) or self.bid_price < bid_prices[-1] - TICK_SIZE_IN_CENTS:
+            new_bid_price, new_ask_price = _quote(self.mid_price, self.position, self.gamma * self.sigma2,
+                                                  self._spread_const, T_minus_t, TICK_SIZE_IN_CENTS,
+                                                  self._half_min_spread_coef, bid_prices[0], ask_prices[0],
+                                                  self.order_optimization_enabled, PRICE_QUANTUM_TICKS)
+
+            # cancel a live order at most once, the id is only reset when the exchange confirms it
+            if (self.bid_id != 0 and self.bid_id != self.bid_cancel_id
+                    and (new_bid_price not in (self.bid_price, 0) or self.bid_price < bid_prices[-1] - TICK_SIZE_IN_CENTS)):
                 self.send_cancel_order(self.bid_id)
+                self.bid_cancel_id = self.bid_id
                 self.logger.info("bid %d to cancel", self.bid_id)
-            if self.ask_id != 0 and new_ask_price not in (self.ask_price, 0) or self.ask_price > ask_prices[-1] + TICK_SIZE_IN_CENTS:
+            if (self.ask_id != 0 and self.ask_id != self.ask_cancel_id
+                    and (new_ask_price not in (self.ask_price, 0) or self.ask_price > ask_prices[-1] + TICK_SIZE_IN_CENTS)):
                 self.send_cancel_order(self.ask_id)
+                self.ask_cancel_id = self.ask_id
                 self.logger.info("ask %d to cancel", self.ask_id)
 
             if self.bid_id == 0 and new_bid_price != 0 and self.position < POSITION_LIMIT:
-                self.bid_id = next(self.order_ids)
+                self.bid_id = self._new_id()
                 self.bid_price = new_bid_price
                 
                 if self.position == -POSITION_LIMIT:
                     volume_bid = 175
                     self.send_insert_order(self.bid_id, Side.BUY, self.bid_price + TICK_SIZE_IN_CENTS, volume_bid, Lifespan.GOOD_FOR_DAY)
-                    self.logger.info(f"bid order {self.bid_id} inserted at price {self.bid_price} for {volume_bid} lots")
+                    self.logger.info("bid order %d inserted at price %d for %d lots", self.bid_id, self.bid_price, volume_bid)
                 else:
                     volume_bid = min(LOT_SIZE*LOT_SIZE_MULTIPLIER, POSITION_LIMIT - self.position)
                     self.send_insert_order(self.bid_id, Side.BUY, self.bid_price, volume_bid, Lifespan.GOOD_FOR_DAY)
-                    self.logger.info(f"bid order {self.bid_id} inserted at price {self.bid_price} for {volume_bid} lots")
-                
-                self.bids.add(self.bid_id)
+                    self.logger.info("bid order %d inserted at price %d for %d lots", self.bid_id, self.bid_price, volume_bid)
 
             if self.ask_id == 0 and new_ask_price != 0 and self.position > -POSITION_LIMIT:
-                self.ask_id = next(self.order_ids)
+                self.ask_id = self._new_id()
                 self.ask_price = new_ask_price
                 
                 if self.position == POSITION_LIMIT:
                     volume_ask = 175
                     self.send_insert_order(self.ask_id, Side.SELL, self.ask_price - TICK_SIZE_IN_CENTS, volume_ask, Lifespan.GOOD_FOR_DAY)
-                    self.logger.info(f"ask order {self.ask_id} inserted at price {self.ask_price} for {volume_ask} lots")
+                    self.logger.info("ask order %d inserted at price %d for %d lots", self.ask_id, self.ask_price, volume_ask)
                 else:
                     volume_ask = min(LOT_SIZE*LOT_SIZE_MULTIPLIER, POSITION_LIMIT + self.position)
                     self.send_insert_order(self.ask_id, Side.SELL, self.ask_price, volume_ask, Lifespan.GOOD_FOR_DAY)
-                    self.logger.info(f"ask order {self.ask_id} inserted at price {self.ask_price} for {volume_ask} lots")
-                    
-                self.asks.add(self.ask_id)
+                    self.logger.info("ask order %d inserted at price %d for %d lots", self.ask_id, self.ask_price, volume_ask)
         
         if instrument == Instrument.ETF and sequence_number > 1:
             #self.kappa_indicator.update(ask_prices, ask_volumes, bid_prices, bid_volumes)
@@ -238,14 +305,14 @@ class AutoTrader(BaseAutoTrader):
         """
         self.logger.info("received order filled for order %d with price %d and volume %d", client_order_id,
                          price, volume)
-        if client_order_id in self.bids:
+        if client_order_id == self.bid_id:
             self.position += volume
-            self.send_hedge_order(next(self.order_ids), Side.ASK, MIN_BID_NEAREST_TICK, volume)
+            self.send_hedge_order(self._new_id(), Side.ASK, MIN_BID_NEAREST_TICK, volume)
             self.send_cancel_order(client_order_id)
             self.logger.info("ask order %d cancelled after being filled at price %d and volume %d", client_order_id, price, volume)
-        elif client_order_id in self.asks:
+        elif client_order_id == self.ask_id:
             self.position -= volume
-            self.send_hedge_order(next(self.order_ids), Side.BID, MAX_ASK_NEAREST_TICK, volume)
+            self.send_hedge_order(self._new_id(), Side.BID, MAX_ASK_NEAREST_TICK, volume)
             #self.send_cancel_order(client_order_id)
             self.logger.info("ask order %d cancelled after being filled at price %d and volume %d", client_order_id, price, volume)
 
@@ -267,18 +334,14 @@ class AutoTrader(BaseAutoTrader):
             if client_order_id == self.bid_id:
                 self.bid_id = 0
                 self.logger.info("bid order %d was cancelled or rejected", client_order_id)
-                self.bids.discard(client_order_id)
             elif client_order_id == self.ask_id:
                 self.ask_id = 0
                 self.logger.info("ask order %d was cancelled or rejected", client_order_id)
-                self.asks.discard(client_order_id)
         elif remaining_volume == 0:
             if client_order_id == self.bid_id:
                 self.bid_id = 0
-                self.bids.discard(client_order_id)
             elif client_order_id == self.ask_id:
                 self.ask_id = 0
-                self.bids.discard(client_order_id)            
             
 
     def on_trade_ticks_message(self, instrument: int, sequence_number: int, ask_prices: List[int],
@@ -304,17 +367,17 @@ class AutoTrader(BaseAutoTrader):
             self.volatility_indicator.add_sample(self.mid_price)
             
             # we adjust kappa and sigma values depends on the volatility and the trend
-            if self.sigma > self.treshold_sigma_max:
-                #self.kappa = self.kappa_indicator.current_kappa()
-                self.kappa = KAPPA + 0.05
-                self.sigma = SIGMA - 0.005
-            elif self.sigma < self.treshold_sigma_min:
-                #self.kappa = self.kappa_indicator.current_kappa()
-                self.kappa = KAPPA - 0.05
-                self.sigma = SIGMA + 0.005
-            elif self.sigma > self.treshold_sigma_min and self.sigma < self.treshold_sigma_max:
-                self.kappa = KAPPA
-                self.sigma = SIGMA
+            if self.sigma2 > self.treshold_sigma2_max:
+                #self._set_kappa(self.kappa_indicator.current_kappa())
+                self._set_kappa(KAPPA + 0.05)
+                self.sigma2 = (SIGMA - 0.005)**2
+            elif self.sigma2 < self.treshold_sigma2_min:
+                #self._set_kappa(self.kappa_indicator.current_kappa())
+                self._set_kappa(KAPPA - 0.05)
+                self.sigma2 = (SIGMA + 0.005)**2
+            elif self.sigma2 > self.treshold_sigma2_min and self.sigma2 < self.treshold_sigma2_max:
+                self._set_kappa(KAPPA)
+                self.sigma2 = SIGMA**2
 
 
 #### Custom Class/functions ####
@@ -322,28 +385,46 @@ class AutoTrader(BaseAutoTrader):
 class VolatilityIndicator():
     """ Use a custom Ring Buffer to calculate the volatility of the last N ticks. """
     def __init__(self):
-        self.buffer = collections.deque(maxlen=BUFFER_VOLATILITY_SIZE)
-        self.sigma = SIGMA
+        self.sigma2 = SIGMA**2
         self.min_size = MIN_TO_COMPUTE_VOLATILITY
+        
+        # ring buffer of the log-returns of the last N ticks and the running sum of their squares
+        self.size = BUFFER_VOLATILITY_SIZE-1
+        self.returns = array('d', [0.0]) * self.size
+        self.n = 0 # number of log-returns ever added
+        self.sum_r2 = 0.0
+        self.last_lp = None
 
     def add_sample(self, sample: float):
-        self.buffer.append(sample)
+        if sample != 0:
+            lp = log(sample)
+            if self.last_lp is not None:
+                r = lp - self.last_lp
+                i = self.n % self.size
+                r_old = self.returns[i] # zero until the buffer is full
+                self.returns[i] = r
+                self.sum_r2 += r * r - r_old * r_old
+                self.n += 1
+            self.last_lp = lp
             
     def calculation(self) -> None:
-        """ Calculate the volatility"""
-        if len(self.buffer) > self.min_size: 
-            self.sigma = np.sqrt(np.sum(np.square(np.log(np.array(self.buffer)[:-1]) - np.log(np.array(self.buffer)[1:])))/(len(self.buffer)-1))
+        """ Calculate the variance"""
+        count = min(self.n, self.size)
+        if count >= self.min_size: 
+            self.sigma2 = max(self.sum_r2, 0.0) / count
     
-    def current_volatility(self) -> float:
+    def current_variance(self) -> float:
         self.calculation()
-        return self.sigma
+        return self.sigma2
+    
+    def current_volatility(self) -> float:
+        return sqrt(self.current_variance())
     
 class KappaIndicator():
     """ Determine the kappa value """
         
     def __init__(self):
-        self.__ask_prices: List[int] = [0]*5
-        self.__bid_prices: List[int] = [0]*5
+        self.__best_ask = self.__best_bid = 0 # top of the previous book, the only levels compared
         
         self.price_levels = collections.deque(maxlen=BUFFER_LAST_QUOTED_SIZE)
         self.volume_levels = collections.deque(maxlen=BUFFER_LAST_QUOTED_SIZE)
@@ -357,30 +438,37 @@ class KappaIndicator():
         It also computes the last traded price by comparing the current book with the previous one and give the volume traded
         """
         # determine the last quoted price knowing that bid prices are sorted in descending order and ask prices in ascending order by comparing the new book with the previous one
-        mid_price = (ask_prices[0] + bid_prices[0]) // 2
+        best_bid = bid_prices[0]
+        best_ask = ask_prices[0]
         
-        if self.__bid_prices[0] != bid_prices[0] and bid_volumes[0] != 0:
-            self.price_levels.append(bid_prices[0])
+        if best_bid != self.__best_bid and bid_volumes[0] != 0:
+            self.price_levels.append(best_bid)
             self.volume_levels.append(bid_volumes[0])
-        if self.__ask_prices[0] != ask_prices[0] and ask_volumes[0] != 0:
-            self.price_levels.append(ask_prices[0])
+        if best_ask != self.__best_ask and ask_volumes[0] != 0:
+            self.price_levels.append(best_ask)
             self.volume_levels.append(ask_volumes[0])
         
-        # update the order book
-        self.__ask_prices = ask_prices
-        self.__bid_prices = bid_prices
+        # update the top of the book
+        self.__best_ask = best_ask
+        self.__best_bid = best_bid
         
     def calculation(self) -> None:
-        """ Calculate the kappa"""
-        if len(self.price_levels) > self.min_size: 
-            self.params = curve_fit(lambda t, a, b: a*np.exp(-b*t),
-                               np.array(self.price_levels),
-                               np.array(self.volume_levels),
-                               p0=(self._alpha, self._kappa),
-                               method='dogbox',
-                               bounds=([0, 0], [np.inf, np.inf]))
-            self._alpha = self.params[0][0]
-            self._kappa = self.params[0][1]
+        """ Calculate the kappa
+        Fit volume = alpha * exp(-kappa * price) by least squares on log(volume) = log(alpha) - kappa * price"""
+        n = len(self.price_levels)
+        if n > self.min_size: 
+            p = np.fromiter(self.price_levels, dtype=np.float64, count=n)
+            ly = np.log(np.fromiter(self.volume_levels, dtype=np.float64, count=n))
+            dp = p - p.mean()
+            ss = dp @ dp
+            if ss == 0: # all quotes at the same price, kappa is not identifiable
+                return
+            lm = ly.mean()
+            b = max(-(dp @ (ly - lm)) / ss, 0.0) # kappa is non-negative
+            a = float(np.exp(lm + b * p.mean()))
+            self.params = (a, b)
+            self._alpha = a
+            self._kappa = b
     
     def current_kappa(self) -> float:
         self.calculation()
@@ -0,0 +1,72 @@
+"""Check autotrader_V1._quote against the Avellaneda-Stoikov formulas, worked out by hand:
+    r = s - q * gamma * sigma^2 * (T - t) * tick
+    delta = 2 * gamma * sigma^2 * (T - t) * tick + spread_const
+bid = floor_tick(r - delta / 2) and ask = floor_tick(r + delta / 2), capped at the best bid and ask.
+Also check that the batched cancels put the same bytes on the wire as one cancel per order."""
+import asyncio
+
+from autotrader_V1 import POSITION_LIMIT, TICK_SIZE_IN_CENTS, AutoTrader, _quote
+from ready_trader_go.base_auto_trader import CANCEL_MESSAGE, CANCEL_MESSAGE_SIZE
+from ready_trader_go.messages import MessageType
+
+# gamma * sigma2 * (T - t) = 0.01 * 4.0 * 0.5 = 0.02
+GAMMA = 0.01
+SIGMA2 = 4.0
+T_MINUS_T = 0.5
+SPREAD_CONST = 1000.0
+LOT_SIZE = 10
+
+
+def quote(position, best_bid, best_ask, mid_price=100000):
+    return _quote(mid_price, best_bid, best_ask, position, SIGMA2, GAMMA, T_MINUS_T, TICK_SIZE_IN_CENTS,
+                  LOT_SIZE, POSITION_LIMIT, SPREAD_CONST)
+
+
+def test_quote_matches_analytic_formulas():
+    # r = 100000 - 10 * 0.02 * 100 = 99980, delta = 2 * 0.02 * 100 + 1000 = 1004
+    # bid = floor_tick(99478) = 99400, ask = floor_tick(100482) = 100400
+    assert quote(10, best_bid=99500, best_ask=100300) == (99400, 100400, 10, 10)
+
+
+def test_quote_never_crosses_the_best_prices():
+    # same quote as above, the ask is lifted to the best ask, the bid is under the best bid so untouched
+    assert quote(10, best_bid=99500, best_ask=100500) == (99400, 100500, 10, 10)
+    # r = 100000 - 95 * 0.02 * 100 = 99810, bid = floor_tick(99308) = 99300, ask = floor_tick(100312) = 100300
+    # the bid is lowered to the best bid, and only 5 lots can be bought before the position limit
+    assert quote(95, best_bid=99200, best_ask=100200) == (99200, 100300, 5, 10)
+
+
+def test_quote_spread_carries_twice_the_inventory_term():
+    # with no inventory and no spread constant, delta = 2 * gamma * sigma^2 * (T - t) * tick = 2 * 1.5 * 100 cents,
+    # so bid = floor_tick(99850) = 99800 and ask = floor_tick(100150) = 100100,
+    # a half-spread of 75 cents would give 99900 and 100000, and an unscaled 3 cents 99900 and 100000 too
+    sigma2 = 300.0 # gamma * sigma2 * (T - t) = 1.5 ticks
+    # best prices set so that neither side is capped
+    assert _quote(100000, 10**9, 0, 0, sigma2, GAMMA, T_MINUS_T, TICK_SIZE_IN_CENTS, LOT_SIZE, POSITION_LIMIT,
+                  0.0) == (99800, 100100, 10, 10)
+
+
+class RecordingTransport:
+    """Stand-in for the execution connection, keeping every write."""
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data: bytes) -> None:
+        self.writes.append(data)
+
+
+def test_send_cancel_orders_matches_send_message():
+    loop = asyncio.new_event_loop()
+    try:
+        trader = AutoTrader(loop, "team", "secret")
+        trader._connection_transport = RecordingTransport()
+        order_ids = [1, 7, 2**31]
+        for order_id in order_ids:
+            trader.send_message(MessageType.CANCEL_ORDER, CANCEL_MESSAGE.pack(order_id), CANCEL_MESSAGE_SIZE)
+        expected = b"".join(trader._connection_transport.writes)
+
+        trader._connection_transport = RecordingTransport()
+        trader.send_cancel_orders(order_ids)
+        assert trader._connection_transport.writes == [expected]
+    finally:
+        loop.close()
@@ -0,0 +1,54 @@
+# Copyright 2021 Optiver Asia Pacific Pty. Ltd.
+#
+# This file is part of Ready Trader Go.
+#
+#     Ready Trader Go is free software: you can redistribute it and/or
+#     modify it under the terms of the GNU Affero General Public License
+#     as published by the Free Software Foundation, either version 3 of
+#     the License, or (at your option) any later version.
+#
+#     Ready Trader Go is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU Affero General Public License for more details.
+#
+#     You should have received a copy of the GNU Affero General Public
+#     License along with Ready Trader Go.  If not, see
+#     <https://www.gnu.org/licenses/>.
+"""Vectorised helpers for the volatility indicators, used to warm up or replay from a whole price series.
+Kept apart from the auto-traders so numpy is only imported when they are used."""
+import math
+
+import numpy as np
+
+
+def bulk_load(indicator, prices) -> np.ndarray:
+    """ Load a whole price series into a VolatilityIndicator at once.
+    Return the volatility of every full window of the series and leave the
+    indicator in the same state as if each price had been added with add_sample."""
+    window = indicator.buffer.maxlen
+    prices = np.asarray(prices, dtype=np.float64)
+    prices = prices[prices != 0]
+    if prices.size == 0:
+        return np.empty(0)
+    log_prices = np.log(prices)
+    if indicator._prev_log is not None:
+        r = np.diff(log_prices, prepend=indicator._prev_log)
+    else:
+        r = np.diff(log_prices)
+
+    # rolling volatility over every window of prices
+    if r.size >= window - 1:
+        w = np.lib.stride_tricks.sliding_window_view(r, window - 1)
+        volatilities = np.sqrt(w.var(axis=-1, ddof=1))
+    else:
+        volatilities = np.empty(0)
+
+    # prime the ring buffers and the rolling sums with the last window
+    indicator.buffer.extend(prices[-window:].tolist())
+    indicator._logrets.extend(r[-(window - 1):].tolist())
+    indicator._logret_sum = math.fsum(indicator._logrets)
+    indicator._logret_sqsum = math.fsum(x * x for x in indicator._logrets)
+    indicator._prev_log = float(log_prices[-1])
+    indicator.calculation()
+    return volatilities